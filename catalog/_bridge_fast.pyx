@@ -0,0 +1,124 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled versions of the Python bridge hot paths
+
+Build in place with `make python-ext`. python_bridge.py falls back to its
+pure-Python implementations when this module is not built, or when
+MOBOT_CYTHON=0 is set. Both implementations must produce identical output.
+"""
+
+
+cpdef dict convert_metadata(dict metadata):
+    """Map a single parser metadata dict onto mobot's catalog fields"""
+    cdef dict caps = metadata["capabilities"]
+    cdef list compositions = metadata["compositions"]
+    cdef list text_layers = []
+    cdef list media_placeholders = []
+    cdef list usage_scenarios = []
+    cdef list effects_used = []
+    cdef dict resolutions = {}
+    cdef dict item
+    cdef Py_ssize_t total_layers = 0
+
+    # Total layers and distinct (width, height) pairs in one pass
+    for item in compositions:
+        total_layers += <Py_ssize_t>item["layer_count"]
+        resolutions[item["width"], item["height"]] = None
+
+    for item in metadata["text_layers"]:
+        text_layers.append({
+            "name": item["layer_name"],
+            "default_text": item["source_text"],
+            "comp": item["comp_id"],
+        })
+
+    for item in metadata["media_assets"]:
+        if item["is_placeholder"]:
+            media_placeholders.append({
+                "name": item["name"],
+                "type": item["type"],
+                "placeholder": item["is_placeholder"],
+            })
+
+    for item in metadata["opportunities"]:
+        usage_scenarios.append({
+            "type": item["type"],
+            "description": item["description"],
+            "difficulty": item["difficulty"],
+            "impact": item["impact"],
+        })
+
+    for item in metadata["effects"]:
+        effects_used.append(item["name"])
+
+    return {
+        "template_path": metadata["file_path"],
+        "template_name": metadata["file_name"],
+        "analyzed_at": metadata["parsed_at"],
+
+        # Basic info
+        "compositions": len(compositions),
+        "total_layers": total_layers,
+
+        # Capabilities (matching mobot's format)
+        "capabilities": {
+            "text_replacement": caps["has_text_replacement"],
+            "image_replacement": caps["has_image_replacement"],
+            "color_control": caps["has_color_control"],
+            "audio_replacement": caps["has_audio_replacement"],
+            "data_driven": caps["has_data_driven"],
+            "expressions": caps["has_expressions"],
+            "modular": caps["is_modular"],
+        },
+
+        # Categories and tags
+        "categories": metadata["categories"],
+        "tags": metadata["tags"],
+
+        # Customizable elements
+        "customizable_elements": {
+            "text_layers": text_layers,
+            "media_placeholders": media_placeholders,
+        },
+
+        # Usage scenarios (from opportunities)
+        "usage_scenarios": usage_scenarios,
+
+        # Technical details
+        "technical_details": {
+            "bit_depth": metadata["bit_depth"],
+            "expression_engine": metadata["expression_engine"],
+            "effects_used": effects_used,
+            "resolutions": [f"{width}x{height}" for width, height in resolutions],
+        },
+    }
+
+
+cpdef tuple aggregate_catalog(list catalog_data):
+    """Compute summary, category and tag counts in a single pass over the catalog"""
+    cdef dict categories = {}
+    cdef dict tags = {}
+    cdef dict template
+    cdef dict caps
+    cdef Py_ssize_t with_text = 0, with_image = 0, modular = 0
+
+    for template in catalog_data:
+        caps = template.get("capabilities", {})
+        if caps.get("text_replacement", False):
+            with_text += 1
+        if caps.get("image_replacement", False):
+            with_image += 1
+        if caps.get("modular", False):
+            modular += 1
+        for value in template.get("categories", ()):
+            categories[value] = categories.get(value, 0) + 1
+        for value in template.get("tags", ()):
+            tags[value] = tags.get(value, 0) + 1
+
+    summary = {
+        "total_templates": len(catalog_data),
+        "with_text_replacement": with_text,
+        "with_image_replacement": with_image,
+        "modular_templates": modular,
+    }
+    return summary, categories, tags
@@ -1,6 +1,8 @@
 package main
 
 import (
+    "bufio"
+    "encoding/json"
     "flag"
     "fmt"
     "log"
@@ -9,6 +11,16 @@ import (
     "github.com/mojosolo/mobot2025/catalog"
 )
 
+// serveRequest is a single newline-delimited parse request read in -serve mode
+type serveRequest struct {
+    Path string `json:"path"`
+}
+
+// serveError is written in place of the metadata when a request fails
+type serveError struct {
+    Error string `json:"error"`
+}
+
 func main() {
     var (
         aepPath      = flag.String("file", "", "Path to AEP file")
@@ -16,11 +28,14 @@ func main() {
         extractText  = flag.Bool("text", true, "Extract text layers")
         extractMedia = flag.Bool("media", true, "Extract media assets")
         deepAnalysis = flag.Bool("deep", true, "Perform deep analysis")
+        serve        = flag.Bool("serve", false, "Read JSON requests from stdin and write one JSON response per line to stdout")
+        compact      = flag.Bool("compact", false, "Emit compact single-line JSON instead of indented JSON")
+        fileList     = flag.String("files", "", "Path to a file listing one AEP path per line; writes one JSON line per path")
     )
     
     flag.Parse()
     
-    if *aepPath == "" {
+    if *aepPath == "" && !*serve && *fileList == "" {
         log.Fatal("Please provide an AEP file path with -file")
     }
     
@@ -30,6 +45,20 @@ func main() {
     parser.ExtractMedia = *extractMedia
     parser.DeepAnalysis = *deepAnalysis
     
+    if *serve {
+        if err := serveRequests(parser); err != nil {
+            log.Fatalf("Serve loop failed: %v", err)
+        }
+        return
+    }
+    
+    if *fileList != "" {
+        if err := parseFileList(parser, *fileList); err != nil {
+            log.Fatalf("Failed to parse file list: %v", err)
+        }
+        return
+    }
+    
     // Parse the project
     metadata, err := parser.ParseProject(*aepPath)
     if err != nil {
@@ -37,7 +66,12 @@ func main() {
     }
     
     // Convert to JSON
-    jsonData, err := metadata.ToJSON()
+    var jsonData []byte
+    if *compact {
+        jsonData, err = json.Marshal(metadata)
+    } else {
+        jsonData, err = metadata.ToJSON()
+    }
     if err != nil {
         log.Fatalf("Failed to convert to JSON: %v", err)
     }
@@ -51,4 +85,75 @@ func main() {
     } else {
         fmt.Println(string(jsonData))
     }
-}
\ No newline at end of file
+}
+
+// serveRequests parses one project per stdin line until stdin is closed.
+// Every request gets exactly one compact JSON line back, either the project
+// metadata or a serveError, so the caller can keep the process alive.
+func serveRequests(parser *catalog.Parser) error {
+    scanner := bufio.NewScanner(os.Stdin)
+    scanner.Buffer(make([]byte, 64*1024), 1024*1024)
+    
+    writer := bufio.NewWriter(os.Stdout)
+    encoder := json.NewEncoder(writer)
+    
+    for scanner.Scan() {
+        var req serveRequest
+        var resp interface{}
+        
+        if err := json.Unmarshal(scanner.Bytes(), &req); err != nil {
+            resp = serveError{Error: fmt.Sprintf("invalid request: %v", err)}
+        } else if metadata, err := parser.ParseProject(req.Path); err != nil {
+            resp = serveError{Error: fmt.Sprintf("Failed to parse project: %v", err)}
+        } else {
+            resp = metadata
+        }
+        
+        // Encode terminates each value with a newline
+        if err := encoder.Encode(resp); err != nil {
+            return err
+        }
+        if err := writer.Flush(); err != nil {
+            return err
+        }
+    }
+    
+    return scanner.Err()
+}
+
+// parseFileList parses every project listed in listPath in a single run,
+// writing one compact JSON line per listed path in the same order.
+func parseFileList(parser *catalog.Parser, listPath string) error {
+    listFile, err := os.Open(listPath)
+    if err != nil {
+        return err
+    }
+    defer listFile.Close()
+    
+    scanner := bufio.NewScanner(listFile)
+    writer := bufio.NewWriter(os.Stdout)
+    encoder := json.NewEncoder(writer)
+    
+    for scanner.Scan() {
+        path := scanner.Text()
+        if path == "" {
+            continue
+        }
+        
+        var resp interface{}
+        if metadata, err := parser.ParseProject(path); err != nil {
+            resp = serveError{Error: fmt.Sprintf("Failed to parse project: %v", err)}
+        } else {
+            resp = metadata
+        }
+        
+        if err := encoder.Encode(resp); err != nil {
+            return err
+        }
+    }
+    if err := scanner.Err(); err != nil {
+        return err
+    }
+    
+    return writer.Flush()
+}
@@ -4,12 +4,21 @@ Python Bridge for Go AEP Parser
 Provides compatibility layer between existing Python cataloging system and new Go parser
 """
 
+import fnmatch
 import json
 import subprocess
 import os
 import sys
+import threading
+import shutil
+import sqlite3
+import weakref
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 from datetime import datetime
 import tempfile
 
@@ -23,14 +32,320 @@ except ImportError:
     MOBOT_AVAILABLE = False
     print("Warning: mobot module not available. Some features will be limited.")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    
+# Optional Cython build of the conversion/aggregation hot paths (make python-ext).
+# Set MOBOT_CYTHON=0 to force the pure-Python implementations.
+CYTHON_AVAILABLE = False
+if os.environ.get("MOBOT_CYTHON", "1") != "0":
+    try:
+        from _bridge_fast import convert_metadata as _fast_convert_metadata
+        from _bridge_fast import aggregate_catalog as _fast_aggregate_catalog
+        CYTHON_AVAILABLE = True
+    except ImportError:
+        pass
+
+# Persistent parse cache shared by every bridge instance on this machine
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "mobot" / "aep_catalog.db"
+
+# Bump when the parser output format changes in a way the binary's own
+# mtime/size would not reveal (e.g. a parser installed from elsewhere)
+PARSE_CACHE_VERSION = 1
+
+# Field extractors used when converting parser output to mobot format
+_TEXT_LAYER_FIELDS = itemgetter("layer_name", "source_text", "comp_id")
+_MEDIA_ASSET_FIELDS = itemgetter("name", "type", "is_placeholder")
+_OPPORTUNITY_FIELDS = itemgetter("type", "description", "difficulty", "impact")
+_EFFECT_NAME = itemgetter("name")
+_COMP_SIZE_FIELDS = itemgetter("layer_count", "width", "height")
+
+# Sort key for (name, count) pairs in the markdown report
+_COUNT = itemgetter(1)
+
+
+def _json_loads(data: bytes) -> Any:
+    """Decode JSON bytes, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+    
+    
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Encode an object as UTF-8 JSON bytes, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def _intern_list(values: List[str]) -> List[str]:
+    """Intern each string so repeated vocabulary shares one object"""
+    return [sys.intern(v) for v in values]
+    
+    
+def _intern_records(records: List[Dict[str, Any]], *keys: str):
+    """Intern the given string fields of each record in place"""
+    for record in records:
+        for key in keys:
+            value = record.get(key)
+            if isinstance(value, str):
+                record[key] = sys.intern(value)
+                
+                
+def _intern_metadata(metadata: Dict[str, Any]):
+    """Intern the small-vocabulary strings of decoded parser metadata in place"""
+    for key in ("categories", "tags"):
+        if metadata.get(key):
+            metadata[key] = _intern_list(metadata[key])
+    _intern_records(metadata.get("effects") or (), "name", "category")
+    _intern_records(metadata.get("media_assets") or (), "type")
+    _intern_records(metadata.get("opportunities") or (), "type", "difficulty", "impact")
+
+
+class _IncrementalJSONWriter:
+    """Write an indented JSON object to a binary file one field at a time
+    
+    Output matches _json_dumps(obj, indent=True), but large arrays are encoded
+    item by item so the whole document never exists as a single buffer.
+    """
+    
+    def __init__(self, f):
+        self.f = f
+        self.first = True
+        f.write(b"{")
+        
+    def _write_key(self, key: str):
+        self.f.write(b"\n  " if self.first else b",\n  ")
+        self.f.write(_json_dumps(key) + b": ")
+        self.first = False
+        
+    def write_field(self, key: str, value: Any):
+        """Write a key and its fully encoded value"""
+        self._write_key(key)
+        # JSON strings never contain raw newlines, so this only re-indents structure
+        self.f.write(_json_dumps(value, indent=True).replace(b"\n", b"\n  "))
+        
+    def write_array_field(self, key: str, items: List[Any]):
+        """Write a key and an array, encoding one element at a time"""
+        self._write_key(key)
+        if not items:
+            self.f.write(b"[]")
+            return
+        self.f.write(b"[")
+        for i, item in enumerate(items):
+            self.f.write(b"\n    " if i == 0 else b",\n    ")
+            self.f.write(_json_dumps(item, indent=True).replace(b"\n", b"\n    "))
+        self.f.write(b"\n  ]")
+        
+    def close(self):
+        """Terminate the object"""
+        self.f.write(b"}" if self.first else b"\n}")
+
+
+class GoParserWorker:
+    """Long-lived Go parser process answering parse requests over stdin/stdout"""
+    
+    def __init__(self, go_parser_path: str):
+        """Start the parser in -serve mode"""
+        self.proc = subprocess.Popen(
+            [go_parser_path, "-serve"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        self.lock = threading.Lock()  # One request in flight per process
+        
+    def parse(self, aep_path: str) -> bytes:
+        """Send a single parse request and return the raw JSON response line"""
+        request = _json_dumps({"path": aep_path}) + b"\n"
+        
+        with self.lock:
+            try:
+                self.proc.stdin.write(request)
+                self.proc.stdin.flush()
+            except (BrokenPipeError, ValueError):
+                raise RuntimeError(f"Go parser exited with code {self.proc.poll()}")
+            line = self.proc.stdout.readline()
+            
+        if not line:
+            raise RuntimeError(f"Go parser exited with code {self.proc.wait()}")
+            
+        # Failures are encoded as {"error": ...}; metadata never starts that way
+        if line.startswith(b'{"error":'):
+            raise RuntimeError(f"Go parser failed: {_json_loads(line)['error']}")
+        return line
+        
+    def is_alive(self) -> bool:
+        """Check whether the parser process is still running"""
+        return self.proc.poll() is None
+        
+    def close(self):
+        """Close stdin so the parser exits, then reap it"""
+        if self.proc.stdin:
+            self.proc.stdin.close()
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        if self.proc.stdout:
+            self.proc.stdout.close()
+
+
+def _close_workers(workers: List[GoParserWorker]):
+    """Close and forget every worker in the list (shared by close() and the finalizer)"""
+    closing = workers[:]
+    workers.clear()
+    for worker in closing:
+        worker.close()
+
 
 class AEPCatalogBridge:
     """Bridge between Go parser and Python cataloging system"""
     
-    def __init__(self, go_parser_path: Optional[str] = None):
-        """Initialize the bridge with optional custom parser path"""
+    def __init__(self, go_parser_path: Optional[str] = None, max_workers: Optional[int] = None,
+                 disk_cache: bool = True, cache_path: Optional[str] = None,
+                 persistent: bool = True):
+        """Initialize the bridge with optional custom parser path, worker count and disk cache
+        
+        With persistent=False every file is parsed by a fresh one-shot parser process
+        instead of the long-lived -serve workers.
+        """
         self.go_parser_path = go_parser_path or self._find_go_parser()
         self.cache = {}  # Cache parsed results
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.persistent = persistent
+        
+        # Parser output persisted across runs, keyed by path, mtime, size and
+        # the identity of the parser binary that produced it
+        self._parser_id = self._parser_identity()
+        self.db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        if disk_cache:
+            self.db = self._open_disk_cache(Path(cache_path) if cache_path else DEFAULT_CACHE_PATH)
+        
+        # Persistent parser processes, started on demand up to max_workers.
+        # _workers holds every live process, checked out or idle; the condition
+        # guards both lists and wakes waiters whenever a slot or worker frees up.
+        self._workers: List[GoParserWorker] = []
+        self._idle_workers: List[GoParserWorker] = []
+        self._worker_cond = threading.Condition()
+        
+        # Reap the workers if the bridge is garbage collected or the interpreter
+        # exits without close(). Holds the list, not self, so it can't keep us alive.
+        self._finalizer = weakref.finalize(self, _close_workers, self._workers)
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        
+    def close(self):
+        """Stop all persistent Go parser processes and close the disk cache"""
+        with self._worker_cond:
+            # Empty _workers in place: the finalizer holds the same list
+            workers = self._workers[:]
+            self._workers.clear()
+            self._idle_workers.clear()
+            self._worker_cond.notify_all()
+        _close_workers(workers)
+            
+        with self._db_lock:
+            if self.db is not None:
+                self.db.close()
+                self.db = None
+                
+    def _open_disk_cache(self, path: Path) -> Optional[sqlite3.Connection]:
+        """Open (or create) the sqlite parse cache, or return None if unavailable"""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS parse_cache_v2 ("
+                "path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, parser TEXT, blob BLOB)"
+            )
+            # Entries from before the parser identity was recorded can't be trusted
+            db.execute("DROP TABLE IF EXISTS parse_cache")
+            return db
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: disk cache disabled ({path}): {e}")
+            return None
+            
+    def _parser_identity(self) -> str:
+        """Describe the parser binary so a rebuilt or upgraded parser misses the cache"""
+        binary = shutil.which(self.go_parser_path) or self.go_parser_path
+        try:
+            st = os.stat(binary)
+        except OSError:
+            return f"v{PARSE_CACHE_VERSION}"
+        return f"v{PARSE_CACHE_VERSION}:{os.path.realpath(binary)}:{st.st_mtime_ns}:{st.st_size}"
+        
+    def _load_cached_blob(self, path: str, st: os.stat_result) -> Optional[bytes]:
+        """Return the stored parser output if the file is unchanged since it was parsed"""
+        if self.db is None:
+            return None
+        with self._db_lock:
+            row = self.db.execute(
+                "SELECT blob FROM parse_cache_v2 WHERE path=? AND mtime=? AND size=? AND parser=?",
+                (path, st.st_mtime_ns, st.st_size, self._parser_id),
+            ).fetchone()
+        return row[0] if row else None
+        
+    def _has_cached_blob(self, path: str, st: os.stat_result) -> bool:
+        """Check whether up-to-date parser output is stored for the file"""
+        if self.db is None:
+            return False
+        with self._db_lock:
+            row = self.db.execute(
+                "SELECT 1 FROM parse_cache_v2 WHERE path=? AND mtime=? AND size=? AND parser=?",
+                (path, st.st_mtime_ns, st.st_size, self._parser_id),
+            ).fetchone()
+        return row is not None
+        
+    def _store_cached_blob(self, path: str, st: os.stat_result, blob: bytes):
+        """Persist parser output for an AEP file"""
+        if self.db is None:
+            return
+        with self._db_lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO parse_cache_v2 (path, mtime, size, parser, blob) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (path, st.st_mtime_ns, st.st_size, self._parser_id, blob),
+            )
+            
+    @contextmanager
+    def _checkout_worker(self) -> Iterator[GoParserWorker]:
+        """Borrow an idle parser process, starting a new one if the pool has room"""
+        with self._worker_cond:
+            while not self._idle_workers and len(self._workers) >= self.max_workers:
+                self._worker_cond.wait()
+            if self._idle_workers:
+                worker = self._idle_workers.pop()
+            else:
+                worker = GoParserWorker(self.go_parser_path)
+                self._workers.append(worker)
+                
+        try:
+            yield worker
+        finally:
+            with self._worker_cond:
+                retired = worker not in self._workers  # pool was closed meanwhile
+                if worker.is_alive() and not retired:
+                    self._idle_workers.append(worker)
+                elif not retired:
+                    # Drop dead workers, freeing their slot for a replacement
+                    self._workers.remove(worker)
+                    retired = True
+                self._worker_cond.notify()
+            if retired:
+                worker.close()
         
     def _find_go_parser(self) -> str:
         """Locate the Go parser executable"""
@@ -44,11 +359,27 @@ class AEPCatalogBridge:
         
         for path in possible_paths:
             if path.exists():
+                if path == possible_paths[1] and self._parser_build_is_stale(path):
+                    # Our own build predates main.go and may lack newer flags
+                    # such as -serve, which every persistent worker relies on
+                    try:
+                        return self._build_go_parser()
+                    except RuntimeError as e:
+                        print(f"Warning: {path} is older than cmd/parser/main.go "
+                              f"and could not be rebuilt: {e}")
                 return str(path)
                 
         # If not found, try to build it
         return self._build_go_parser()
         
+    def _parser_build_is_stale(self, binary: Path) -> bool:
+        """Check whether the parser source changed after the binary was built"""
+        parser_main = Path(__file__).parent / "cmd" / "parser" / "main.go"
+        try:
+            return parser_main.stat().st_mtime_ns > binary.stat().st_mtime_ns
+        except OSError:
+            return False
+        
     def _build_go_parser(self) -> str:
         """Build the Go parser if not already built"""
         parser_dir = Path(__file__).parent
@@ -81,15 +412,26 @@ class AEPCatalogBridge:
         main_go.write_text('''package main
 
 import (
+    "bufio"
     "encoding/json"
     "flag"
     "fmt"
     "log"
     "os"
     
-    "github.com/boltframe/aftereffects-aep-parser/catalog"
+    "github.com/mojosolo/mobot2025/catalog"
 )
 
+// serveRequest is a single newline-delimited parse request read in -serve mode
+type serveRequest struct {
+    Path string `json:"path"`
+}
+
+// serveError is written in place of the metadata when a request fails
+type serveError struct {
+    Error string `json:"error"`
+}
+
 func main() {
     var (
         aepPath      = flag.String("file", "", "Path to AEP file")
@@ -97,11 +439,14 @@ func main() {
         extractText  = flag.Bool("text", true, "Extract text layers")
         extractMedia = flag.Bool("media", true, "Extract media assets")
         deepAnalysis = flag.Bool("deep", true, "Perform deep analysis")
+        serve        = flag.Bool("serve", false, "Read JSON requests from stdin and write one JSON response per line to stdout")
+        compact      = flag.Bool("compact", false, "Emit compact single-line JSON instead of indented JSON")
+        fileList     = flag.String("files", "", "Path to a file listing one AEP path per line; writes one JSON line per path")
     )
     
     flag.Parse()
     
-    if *aepPath == "" {
+    if *aepPath == "" && !*serve && *fileList == "" {
         log.Fatal("Please provide an AEP file path with -file")
     }
     
@@ -111,6 +456,20 @@ func main() {
     parser.ExtractMedia = *extractMedia
     parser.DeepAnalysis = *deepAnalysis
     
+    if *serve {
+        if err := serveRequests(parser); err != nil {
+            log.Fatalf("Serve loop failed: %v", err)
+        }
+        return
+    }
+    
+    if *fileList != "" {
+        if err := parseFileList(parser, *fileList); err != nil {
+            log.Fatalf("Failed to parse file list: %v", err)
+        }
+        return
+    }
+    
     // Parse the project
     metadata, err := parser.ParseProject(*aepPath)
     if err != nil {
@@ -118,7 +477,12 @@ func main() {
     }
     
     // Convert to JSON
-    jsonData, err := metadata.ToJSON()
+    var jsonData []byte
+    if *compact {
+        jsonData, err = json.Marshal(metadata)
+    } else {
+        jsonData, err = metadata.ToJSON()
+    }
     if err != nil {
         log.Fatalf("Failed to convert to JSON: %v", err)
     }
@@ -133,67 +497,314 @@ func main() {
         fmt.Println(string(jsonData))
     }
 }
+
+// serveRequests parses one project per stdin line until stdin is closed.
+// Every request gets exactly one compact JSON line back, either the project
+// metadata or a serveError, so the caller can keep the process alive.
+func serveRequests(parser *catalog.Parser) error {
+    scanner := bufio.NewScanner(os.Stdin)
+    scanner.Buffer(make([]byte, 64*1024), 1024*1024)
+    
+    writer := bufio.NewWriter(os.Stdout)
+    encoder := json.NewEncoder(writer)
+    
+    for scanner.Scan() {
+        var req serveRequest
+        var resp interface{}
+        
+        if err := json.Unmarshal(scanner.Bytes(), &req); err != nil {
+            resp = serveError{Error: fmt.Sprintf("invalid request: %v", err)}
+        } else if metadata, err := parser.ParseProject(req.Path); err != nil {
+            resp = serveError{Error: fmt.Sprintf("Failed to parse project: %v", err)}
+        } else {
+            resp = metadata
+        }
+        
+        // Encode terminates each value with a newline
+        if err := encoder.Encode(resp); err != nil {
+            return err
+        }
+        if err := writer.Flush(); err != nil {
+            return err
+        }
+    }
+    
+    return scanner.Err()
+}
+
+// parseFileList parses every project listed in listPath in a single run,
+// writing one compact JSON line per listed path in the same order.
+func parseFileList(parser *catalog.Parser, listPath string) error {
+    listFile, err := os.Open(listPath)
+    if err != nil {
+        return err
+    }
+    defer listFile.Close()
+    
+    scanner := bufio.NewScanner(listFile)
+    writer := bufio.NewWriter(os.Stdout)
+    encoder := json.NewEncoder(writer)
+    
+    for scanner.Scan() {
+        path := scanner.Text()
+        if path == "" {
+            continue
+        }
+        
+        var resp interface{}
+        if metadata, err := parser.ParseProject(path); err != nil {
+            resp = serveError{Error: fmt.Sprintf("Failed to parse project: %v", err)}
+        } else {
+            resp = metadata
+        }
+        
+        if err := encoder.Encode(resp); err != nil {
+            return err
+        }
+    }
+    if err := scanner.Err(); err != nil {
+        return err
+    }
+    
+    return writer.Flush()
+}
 ''')
         
     def parse_aep(self, aep_path: str, use_cache: bool = True) -> Dict[str, Any]:
         """Parse an AEP file using the Go parser"""
         aep_path = Path(aep_path).resolve()
         
-        if not aep_path.exists():
-            raise FileNotFoundError(f"AEP file not found: {aep_path}")
+        try:
+            st = aep_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"AEP file not found: {aep_path}") from None
             
+        return self._parse_file(str(aep_path), st, use_cache)
+        
+    def _parse_file(self, cache_key: str, st: os.stat_result, use_cache: bool = True,
+                    raw: Optional[bytes] = None) -> Dict[str, Any]:
+        """Parse an already-located AEP file given its path and stat result
+        
+        raw is parser output already produced for this file by a batch run.
+        """
         # Check cache
-        cache_key = str(aep_path)
         if use_cache and cache_key in self.cache:
             return self.cache[cache_key]
             
-        # Create temporary output file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as tmp:
-            tmp_path = tmp.name
+        fresh = raw is not None
+        
+        # Reuse the stored output if the file hasn't changed since the last run
+        if raw is None and use_cache:
+            raw = self._load_cached_blob(cache_key, st)
             
+        if raw is None:
+            raw = self._run_go_parser(cache_key)
+            fresh = True
+            
+        if fresh and use_cache:
+            self._store_cached_blob(cache_key, st, raw)
+                
+        metadata = _json_loads(raw)
+        _intern_metadata(metadata)
+        
+        # Cache the result
+        if use_cache:
+            self.cache[cache_key] = metadata
+            
+        return metadata
+                
+    def _run_go_parser(self, aep_path: str) -> bytes:
+        """Run the Go parser on a single file and return its raw JSON output"""
+        if self.persistent:
+            # Hand the file to one of the persistent parser processes
+            with self._checkout_worker() as worker:
+                return worker.parse(aep_path)
+                
+        # One-shot run: read the JSON straight off the stdout pipe. With
+        # close_fds=False and an absolute parser path, subprocess launches via
+        # posix_spawn instead of fork+exec; descriptors Python opens are
+        # non-inheritable (PEP 446), so nothing extra leaks into the child.
         try:
-            # Run the Go parser
             result = subprocess.run(
-                [self.go_parser_path, "-file", str(aep_path), "-output", tmp_path],
-                capture_output=True,
-                text=True,
+                [self.go_parser_path, "-file", aep_path, "-compact"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                close_fds=False,
                 check=True
             )
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"Go parser failed: {e.stderr.decode(errors='replace').strip()}")
+        return result.stdout
+        
+    def _run_go_parser_batch(self, aep_paths: List[str]) -> Dict[str, bytes]:
+        """Parse many files with up to max_workers concurrent one-shot parser runs
+        
+        Returns raw JSON output for each file that parsed successfully; failed
+        files are left out so callers can retry them individually. So are paths
+        containing a newline, which can't be written to the line-based list.
+        """
+        listable = [path for path in aep_paths if "\n" not in path]
+        runs = min(self.max_workers, len(listable))
+        if runs <= 1:
+            return self._run_go_parser_list(listable) if listable else {}
             
-            # Read the JSON output
-            with open(tmp_path, 'r') as f:
-                metadata = json.load(f)
-                
-            # Cache the result
-            if use_cache:
-                self.cache[cache_key] = metadata
+        # Interleave the paths so each run gets a similar share of the work
+        output: Dict[str, bytes] = {}
+        with ThreadPoolExecutor(max_workers=runs) as executor:
+            for run_output in executor.map(self._run_go_parser_list,
+                                           [listable[i::runs] for i in range(runs)]):
+                output.update(run_output)
+        return output
+        
+    def _run_go_parser_list(self, aep_paths: List[str]) -> Dict[str, bytes]:
+        """Parse the given files with a single -files parser run"""
+        file_list = b"\n".join(map(os.fsencode, aep_paths)) + b"\n"
+        
+        # Linux: hand the list over as an anonymous in-memory file, so no /tmp
+        # entry is created; the child opens it via its inherited fd. Kernels
+        # without memfd support (or out of fds) get a temporary file instead.
+        list_fd = None
+        if hasattr(os, "memfd_create"):
+            try:
+                list_fd = os.memfd_create("aep_file_list")
+            except OSError:
+                pass
                 
-            return metadata
+        if list_fd is not None:
+            with open(list_fd, 'wb', closefd=False) as f:
+                f.write(file_list)
+            list_path = f"/proc/self/fd/{list_fd}"
+            spawn_args = {"pass_fds": (list_fd,)}
+        else:
+            with tempfile.NamedTemporaryFile(suffix='.txt', delete=False) as tmp:
+                tmp.write(file_list)
+            list_path = tmp.name
+            spawn_args = {"close_fds": False}
             
+        try:
+            result = subprocess.run(
+                [self.go_parser_path, "-files", list_path],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                check=True,
+                **spawn_args
+            )
         except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"Go parser failed: {e.stderr}")
+            print(f"Batch parse failed, falling back to per-file runs: {e.stderr.decode(errors='replace').strip()}")
+            return {}
         finally:
-            # Clean up temp file
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+            if list_fd is not None:
+                os.close(list_fd)
+            else:
+                os.unlink(list_path)
                 
+        # One output line per listed path, in order. Check each result belongs
+        # to its path and stop trusting the output once the two fall out of step.
+        output = {}
+        for path, line in zip(aep_paths, result.stdout.splitlines()):
+            if line.startswith(b'{"error":'):
+                continue
+            try:
+                parsed_path = _json_loads(line).get("file_path")
+            except ValueError:
+                parsed_path = None
+            if parsed_path != path:
+                print(f"Batch output out of step at {path}, falling back to per-file runs")
+                break
+            output[path] = line
+        return output
+        
+    def _scan_aep_files(self, directory: str, pattern: str) -> Iterator[Tuple[str, os.stat_result]]:
+        """Recursively yield (path, stat) for files matching pattern, like Path.rglob
+        
+        Symlinked files are reported under their target's path, as parse_aep would.
+        """
+        try:
+            with os.scandir(directory) as scanner:
+                entries = list(scanner)
+        except OSError:
+            return
+            
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif fnmatch.fnmatch(entry.name, pattern) and entry.is_file():
+                    path = os.path.realpath(entry.path) if entry.is_symlink() else entry.path
+                    yield path, entry.stat()
+            except OSError:
+                continue
+                
+        for subdir in subdirs:
+            yield from self._scan_aep_files(subdir, pattern)
+            
+    def batch_process(self, paths: List[str], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Parse many AEP files concurrently, reporting and skipping failures"""
+        aep_files = []
+        for path in paths:
+            aep_path = Path(path).resolve()
+            try:
+                aep_files.append((str(aep_path), aep_path.stat()))
+            except OSError as e:
+                print(f"Error parsing {aep_path}: {e}")
+                
+        return self._parse_files(aep_files, max_workers)
+        
     def catalog_directory(self, directory: str, pattern: str = "*.aep") -> List[Dict[str, Any]]:
         """Catalog all AEP files in a directory"""
-        directory = Path(directory)
+        # Resolve once so scanned paths are canonical; only symlinked files
+        # still need resolving, which _scan_aep_files does per entry
+        directory = Path(directory).resolve()
+        aep_files = list(self._scan_aep_files(str(directory), pattern))
+        return self._parse_files(aep_files)
+        
+    def _parse_files(self, aep_files: List[Tuple[str, os.stat_result]],
+                     max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Parse located (path, stat) pairs concurrently, preserving input order"""
         results = []
         
-        for aep_file in directory.rglob(pattern):
-            try:
-                metadata = self.parse_aep(str(aep_file))
-                results.append(metadata)
-            except Exception as e:
-                print(f"Error parsing {aep_file}: {e}")
-                continue
+        # One-shot mode: parse everything missing from the caches in a few list runs
+        batch_output: Dict[str, bytes] = {}
+        if not self.persistent:
+            uncached = [
+                path for path, st in aep_files
+                if path not in self.cache and not self._has_cached_blob(path, st)
+            ]
+            if uncached:
+                batch_output = self._run_go_parser_batch(uncached)
                 
+        # Parsing happens in the Go processes, so threads only wait on pipes
+        with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as executor:
+            futures = [
+                executor.submit(self._parse_file, path, st, True, batch_output.get(path))
+                for path, st in aep_files
+            ]
+            
+            for (aep_file, _), future in zip(aep_files, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    print(f"Error parsing {aep_file}: {e}")
+                    continue
+                    
         return results
         
     def convert_to_mobot_format(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
         """Convert Go parser output to mobot catalog format"""
+        if CYTHON_AVAILABLE:
+            return _fast_convert_metadata(metadata)
+            
+        caps = metadata["capabilities"]
+        compositions = metadata["compositions"]
+        
+        # Total layers and distinct (width, height) pairs in one pass
+        total_layers = 0
+        resolutions = {}
+        for layer_count, width, height in map(_COMP_SIZE_FIELDS, compositions):
+            total_layers += layer_count
+            resolutions[width, height] = None
+            
         # Map Go parser format to mobot's expected format
         mobot_format = {
             "template_path": metadata["file_path"],
@@ -201,18 +812,18 @@ func main() {
             "analyzed_at": metadata["parsed_at"],
             
             # Basic info
-            "compositions": len(metadata["compositions"]),
-            "total_layers": sum(c["layer_count"] for c in metadata["compositions"]),
+            "compositions": len(compositions),
+            "total_layers": total_layers,
             
             # Capabilities (matching mobot's format)
             "capabilities": {
-                "text_replacement": metadata["capabilities"]["has_text_replacement"],
-                "image_replacement": metadata["capabilities"]["has_image_replacement"],
-                "color_control": metadata["capabilities"]["has_color_control"],
-                "audio_replacement": metadata["capabilities"]["has_audio_replacement"],
-                "data_driven": metadata["capabilities"]["has_data_driven"],
-                "expressions": metadata["capabilities"]["has_expressions"],
-                "modular": metadata["capabilities"]["is_modular"],
+                "text_replacement": caps["has_text_replacement"],
+                "image_replacement": caps["has_image_replacement"],
+                "color_control": caps["has_color_control"],
+                "audio_replacement": caps["has_audio_replacement"],
+                "data_driven": caps["has_data_driven"],
+                "expressions": caps["has_expressions"],
+                "modular": caps["is_modular"],
             },
             
             # Categories and tags
@@ -223,43 +834,40 @@ func main() {
             "customizable_elements": {
                 "text_layers": [
                     {
-                        "name": t["layer_name"],
-                        "default_text": t["source_text"],
-                        "comp": t["comp_id"],
+                        "name": name,
+                        "default_text": text,
+                        "comp": comp,
                     }
-                    for t in metadata["text_layers"]
+                    for name, text, comp in map(_TEXT_LAYER_FIELDS, metadata["text_layers"])
                 ],
                 "media_placeholders": [
                     {
-                        "name": m["name"],
-                        "type": m["type"],
-                        "placeholder": m["is_placeholder"],
+                        "name": name,
+                        "type": media_type,
+                        "placeholder": placeholder,
                     }
-                    for m in metadata["media_assets"]
-                    if m["is_placeholder"]
+                    for name, media_type, placeholder in map(_MEDIA_ASSET_FIELDS, metadata["media_assets"])
+                    if placeholder
                 ],
             },
             
             # Usage scenarios (from opportunities)
             "usage_scenarios": [
                 {
-                    "type": o["type"],
-                    "description": o["description"],
-                    "difficulty": o["difficulty"],
-                    "impact": o["impact"],
+                    "type": opp_type,
+                    "description": description,
+                    "difficulty": difficulty,
+                    "impact": impact,
                 }
-                for o in metadata["opportunities"]
+                for opp_type, description, difficulty, impact in map(_OPPORTUNITY_FIELDS, metadata["opportunities"])
             ],
             
             # Technical details
             "technical_details": {
                 "bit_depth": metadata["bit_depth"],
                 "expression_engine": metadata["expression_engine"],
-                "effects_used": [e["name"] for e in metadata["effects"]],
-                "resolutions": list(set(
-                    f"{c['width']}x{c['height']}" 
-                    for c in metadata["compositions"]
-                )),
+                "effects_used": list(map(_EFFECT_NAME, metadata["effects"])),
+                "resolutions": [f"{width}x{height}" for width, height in resolutions],
             },
         }
         
@@ -267,6 +875,8 @@ func main() {
         
     def generate_catalog_report(self, catalog_data: List[Dict[str, Any]], output_path: str):
         """Generate a catalog report compatible with mobot's format"""
+        summary, categories, tags = self._aggregate_catalog(catalog_data)
+        
         report = {
             "catalog_version": "2.0",
             "generated_at": datetime.now().isoformat(),
@@ -275,55 +885,64 @@ func main() {
             "templates": catalog_data,
             
             # Summary statistics
-            "summary": {
-                "total_templates": len(catalog_data),
-                "with_text_replacement": sum(
-                    1 for t in catalog_data 
-                    if t.get("capabilities", {}).get("text_replacement", False)
-                ),
-                "with_image_replacement": sum(
-                    1 for t in catalog_data 
-                    if t.get("capabilities", {}).get("image_replacement", False)
-                ),
-                "modular_templates": sum(
-                    1 for t in catalog_data 
-                    if t.get("capabilities", {}).get("modular", False)
-                ),
-            },
+            "summary": summary,
             
             # Category breakdown
-            "categories": self._aggregate_categories(catalog_data),
-            "tags": self._aggregate_tags(catalog_data),
+            "categories": categories,
+            "tags": tags,
         }
         
-        # Save as JSON
+        # Save as JSON, streaming templates so no full-document buffer is built
         output_path = Path(output_path)
-        with open(output_path, 'w') as f:
-            json.dump(report, f, indent=2)
+        with open(output_path, 'wb', buffering=1 << 20) as f:
+            writer = _IncrementalJSONWriter(f)
+            for key, value in report.items():
+                if key == "templates":
+                    writer.write_array_field(key, value)
+                else:
+                    writer.write_field(key, value)
+            writer.close()
             
         # Also generate markdown report
         md_path = output_path.with_suffix('.md')
         self._generate_markdown_report(report, md_path)
         
-    def _aggregate_categories(self, catalog_data: List[Dict[str, Any]]) -> Dict[str, int]:
-        """Aggregate category counts"""
-        categories = {}
-        for template in catalog_data:
-            for cat in template.get("categories", []):
-                categories[cat] = categories.get(cat, 0) + 1
-        return categories
+    def _aggregate_catalog(
+        self, catalog_data: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, int], Dict[str, int], Dict[str, int]]:
+        """Compute summary, category and tag counts in a single pass over the catalog"""
+        if CYTHON_AVAILABLE:
+            return _fast_aggregate_catalog(catalog_data)
+            
+        categories = Counter()
+        tags = Counter()
+        with_text = with_image = modular = 0
         
-    def _aggregate_tags(self, catalog_data: List[Dict[str, Any]]) -> Dict[str, int]:
-        """Aggregate tag counts"""
-        tags = {}
         for template in catalog_data:
-            for tag in template.get("tags", []):
-                tags[tag] = tags.get(tag, 0) + 1
-        return tags
+            caps = template.get("capabilities", {})
+            if caps.get("text_replacement", False):
+                with_text += 1
+            if caps.get("image_replacement", False):
+                with_image += 1
+            if caps.get("modular", False):
+                modular += 1
+            categories.update(template.get("categories", ()))
+            tags.update(template.get("tags", ()))
+            
+        summary = {
+            "total_templates": len(catalog_data),
+            "with_text_replacement": with_text,
+            "with_image_replacement": with_image,
+            "modular_templates": modular,
+        }
+        return summary, dict(categories), dict(tags)
         
     def _generate_markdown_report(self, report: Dict[str, Any], output_path: Path):
         """Generate a human-readable markdown report"""
-        md_content = f"""# AEP Template Catalog Report
+        parts = []
+        append = parts.append
+        
+        append(f"""# AEP Template Catalog Report
 
 Generated: {report['generated_at']}
 Total Templates: {report['total_templates']}
@@ -337,39 +956,39 @@ Parser: {report['parser']}
 
 ## Categories
 
-"""
+""")
         
-        for cat, count in sorted(report['categories'].items(), key=lambda x: x[1], reverse=True):
-            md_content += f"- **{cat}**: {count} templates\n"
+        for cat, count in sorted(report['categories'].items(), key=_COUNT, reverse=True):
+            append(f"- **{cat}**: {count} templates\n")
             
-        md_content += "\n## Tags\n\n"
+        append("\n## Tags\n\n")
         
-        for tag, count in sorted(report['tags'].items(), key=lambda x: x[1], reverse=True):
-            md_content += f"- `{tag}`: {count} templates\n"
+        for tag, count in sorted(report['tags'].items(), key=_COUNT, reverse=True):
+            append(f"- `{tag}`: {count} templates\n")
             
-        md_content += "\n## Template Details\n\n"
+        append("\n## Template Details\n\n")
         
         for template in report['templates']:
-            md_content += f"### {template['template_name']}\n\n"
-            md_content += f"- **Path**: `{template['template_path']}`\n"
-            md_content += f"- **Categories**: {', '.join(template['categories'])}\n"
-            md_content += f"- **Tags**: {', '.join(template['tags'])}\n"
+            append(f"### {template['template_name']}\n\n")
+            append(f"- **Path**: `{template['template_path']}`\n")
+            append(f"- **Categories**: {', '.join(template['categories'])}\n")
+            append(f"- **Tags**: {', '.join(template['tags'])}\n")
             
             caps = template['capabilities']
-            md_content += f"- **Capabilities**:\n"
+            append(f"- **Capabilities**:\n")
             for cap, enabled in caps.items():
                 if enabled:
-                    md_content += f"  - ✅ {cap.replace('_', ' ').title()}\n"
+                    append(f"  - ✅ {cap.replace('_', ' ').title()}\n")
                     
             if template.get('usage_scenarios'):
-                md_content += f"- **Usage Scenarios**:\n"
+                append(f"- **Usage Scenarios**:\n")
                 for scenario in template['usage_scenarios']:
-                    md_content += f"  - {scenario['description']} ({scenario['difficulty']} difficulty, {scenario['impact']} impact)\n"
+                    append(f"  - {scenario['description']} ({scenario['difficulty']} difficulty, {scenario['impact']} impact)\n")
                     
-            md_content += "\n"
+            append("\n")
             
         with open(output_path, 'w') as f:
-            f.write(md_content)
+            f.write("".join(parts))
             
     def integrate_with_nexrender(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
         """Generate nexrender configuration from metadata"""
@@ -392,39 +1011,38 @@ if __name__ == "__main__":
     
     args = parser.parse_args()
     
-    bridge = AEPCatalogBridge()
-    
-    if args.command == "parse":
-        # Parse single file
-        metadata = bridge.parse_aep(args.path)
-        
-        if args.mobot_format:
-            metadata = bridge.convert_to_mobot_format(metadata)
+    with AEPCatalogBridge() as bridge:
+        if args.command == "parse":
+            # Parse single file
+            metadata = bridge.parse_aep(args.path)
             
-        if args.output:
-            with open(args.output, 'w') as f:
-                json.dump(metadata, f, indent=2)
-        else:
-            print(json.dumps(metadata, indent=2))
+            if args.mobot_format:
+                metadata = bridge.convert_to_mobot_format(metadata)
+                
+            if args.output:
+                with open(args.output, 'wb') as f:
+                    f.write(_json_dumps(metadata, indent=True))
+            else:
+                print(_json_dumps(metadata, indent=True).decode())
+                
+        elif args.command == "catalog":
+            # Catalog directory
+            catalog_data = bridge.catalog_directory(args.path)
             
-    elif args.command == "catalog":
-        # Catalog directory
-        catalog_data = bridge.catalog_directory(args.path)
-        
-        if args.mobot_format:
+            if args.mobot_format:
+                catalog_data = [bridge.convert_to_mobot_format(m) for m in catalog_data]
+                
+            if args.output:
+                with open(args.output, 'wb') as f:
+                    f.write(_json_dumps(catalog_data, indent=True))
+            else:
+                print(f"Cataloged {len(catalog_data)} templates")
+                
+        elif args.command == "report":
+            # Generate report
+            catalog_data = bridge.catalog_directory(args.path)
             catalog_data = [bridge.convert_to_mobot_format(m) for m in catalog_data]
             
-        if args.output:
-            with open(args.output, 'w') as f:
-                json.dump(catalog_data, f, indent=2)
-        else:
-            print(f"Cataloged {len(catalog_data)} templates")
-            
-    elif args.command == "report":
-        # Generate report
-        catalog_data = bridge.catalog_directory(args.path)
-        catalog_data = [bridge.convert_to_mobot_format(m) for m in catalog_data]
-        
-        output_path = args.output or "catalog_report.json"
-        bridge.generate_catalog_report(catalog_data, output_path)
-        print(f"Report generated: {output_path}")
\ No newline at end of file
+            output_path = args.output or "catalog_report.json"
+            bridge.generate_catalog_report(catalog_data, output_path)
+            print(f"Report generated: {output_path}")
\ No newline at end of file
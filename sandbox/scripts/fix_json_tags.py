@@ -1,19 +1,19 @@
 #!/usr/bin/env python3
 import re
 
-# Read the file
-with open('catalog/implementation_agent.go', 'r') as f:
-    content = f.read()
-
 # Pattern to match escaped backticks in struct tags
-pattern = r'\\`json:"([^"]+)"\\`'
-replacement = r'` + "`json:\"\1\"`" + `'
+pattern = re.compile(rb'\\`json:"([^"]+)"\\`')
+replacement = rb'` + "`json:\"\1\"`" + `'
+
+# Read the file as bytes so the regex runs without a decode/encode round-trip
+with open('catalog/implementation_agent.go', 'rb') as f:
+    content = f.read()
 
 # Replace all occurrences
-fixed_content = re.sub(pattern, replacement, content)
+fixed_content = pattern.sub(replacement, content)
 
 # Write back
-with open('catalog/implementation_agent.go', 'w') as f:
+with open('catalog/implementation_agent.go', 'wb') as f:
     f.write(fixed_content)
 
-print("Fixed all JSON struct tags")
\ No newline at end of file
+print("Fixed all JSON struct tags")
@@ -9,12 +9,13 @@ import json
 import os
 import sys
 from pathlib import Path
+from typing import List
 from unittest.mock import Mock, patch, MagicMock
 
 # Add the catalog directory to Python path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "catalog"))
 
-from python_bridge import AEPCatalogBridge
+from python_bridge import AEPCatalogBridge, CYTHON_AVAILABLE
 
 
 class TestAEPCatalogBridge(unittest.TestCase):
@@ -192,6 +193,362 @@ class TestAEPCatalogBridge(unittest.TestCase):
             self.assertIn("avg_parse_time", metrics)
 
 
+class TestBridgeWithoutGo(unittest.TestCase):
+    """Test cases that stub out the Go parser process"""
+    
+    def setUp(self):
+        """Set up a bridge with a private disk cache"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.bridge = AEPCatalogBridge(
+            go_parser_path="aep_parser",
+            cache_path=str(Path(self.temp_dir) / "cache.db"),
+        )
+        
+    def tearDown(self):
+        """Clean up after tests"""
+        import shutil
+        self.bridge.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        
+    def _make_serve_parser(self) -> str:
+        """Write a stand-in -serve parser that exits on any path containing 'crash'"""
+        script = Path(self.temp_dir) / "fake_parser"
+        script.write_text(f"""#!{sys.executable}
+import json, os, sys
+for line in sys.stdin:
+    path = json.loads(line)["path"]
+    if "crash" in path:
+        sys.exit(2)
+    sys.stdout.write(json.dumps({{"file_name": os.path.basename(path)}}) + "\\n")
+    sys.stdout.flush()
+""")
+        script.chmod(0o755)
+        return str(script)
+        
+    def _make_list_parser(self) -> str:
+        """Write a stand-in one-shot parser that logs each -files run it serves"""
+        script = Path(self.temp_dir) / "fake_list_parser"
+        log = Path(self.temp_dir) / "list_runs.log"
+        script.write_text(f"""#!{sys.executable}
+import json, os, sys
+def parse(path):
+    return json.dumps({{"file_path": path, "file_name": os.path.basename(path)}})
+if sys.argv[1] == "-files":
+    with open({str(log)!r}, "a") as log:
+        log.write("run\\n")
+    # Line-based, like the Go parser's bufio.Scanner
+    for path in open(sys.argv[2]).read().split("\\n"):
+        if path:
+            sys.stdout.write(parse(path) + "\\n")
+else:
+    sys.stdout.write(parse(sys.argv[2]))
+""")
+        script.chmod(0o755)
+        return str(script)
+        
+    def _make_aep_files(self, directory: Path, names: List[str]) -> List[str]:
+        """Create placeholder AEP files and return their paths"""
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for name in names:
+            path = directory / name
+            path.write_bytes(b"RIFX")
+            paths.append(str(path))
+        return paths
+        
+    def test_worker_pool_survives_dead_workers(self):
+        """Test waiting threads get a replacement when a checked-out worker dies"""
+        import threading
+        
+        aep_dir = Path(self.temp_dir) / "templates"
+        self._make_aep_files(aep_dir, ["a.aep", "b.aep", "crash1.aep", "crash2.aep"])
+        bridge = AEPCatalogBridge(
+            go_parser_path=self._make_serve_parser(),
+            max_workers=1,
+            disk_cache=False,
+        )
+        results = []
+        
+        def catalog():
+            results.append(bridge.catalog_directory(str(aep_dir)))
+            
+        # Two callers share one worker slot, and every crash kills the worker
+        threads = [threading.Thread(target=catalog, daemon=True) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+        bridge.close()
+        
+        self.assertFalse(any(thread.is_alive() for thread in threads), "worker pool deadlocked")
+        for parsed in results:
+            self.assertEqual(sorted(m["file_name"] for m in parsed), ["a.aep", "b.aep"])
+            
+    def test_catalog_directory_resolves_symlinked_files(self):
+        """Test a symlinked AEP is parsed under its target's path"""
+        aep_dir = Path(self.temp_dir) / "templates"
+        target = self._make_aep_files(Path(self.temp_dir) / "elsewhere", ["real.aep"])[0]
+        aep_dir.mkdir()
+        (aep_dir / "link.aep").symlink_to(target)
+        
+        worker = MagicMock()
+        worker.parse.return_value = b'{"file_name": "real.aep"}'
+        with patch.object(self.bridge, '_checkout_worker') as mock_checkout:
+            mock_checkout.return_value.__enter__.return_value = worker
+            results = self.bridge.catalog_directory(str(aep_dir))
+            
+        self.assertEqual(len(results), 1)
+        worker.parse.assert_called_once_with(os.path.realpath(target))
+        self.assertIn(os.path.realpath(target), self.bridge.cache)
+        
+    def test_find_go_parser_rebuilds_stale_binary(self):
+        """Test a built parser older than main.go is rebuilt before use"""
+        catalog_dir = Path(self.temp_dir) / "catalog"
+        binary = catalog_dir / "bin" / "aep_parser"
+        parser_main = catalog_dir / "cmd" / "parser" / "main.go"
+        for path in (binary, parser_main):
+            path.parent.mkdir(parents=True)
+            path.write_text("")
+        os.utime(binary, ns=(1_000_000_000, 1_000_000_000))
+        
+        with patch("python_bridge.__file__", str(catalog_dir / "python_bridge.py")), \
+             patch.object(AEPCatalogBridge, '_build_go_parser', return_value="rebuilt") as mock_build:
+            self.assertEqual(self.bridge._find_go_parser(), "rebuilt")
+            
+            # Once the binary is newer than its source it is used as is
+            os.utime(parser_main, ns=(0, 0))
+            self.assertEqual(self.bridge._find_go_parser(), str(binary))
+        mock_build.assert_called_once()
+        
+    def test_one_shot_batch_matches_output_to_paths(self):
+        """Test one-shot list runs split across workers and keep each file's own output"""
+        aep_dir = Path(self.temp_dir) / "templates"
+        paths = self._make_aep_files(aep_dir, [f"f{i}.aep" for i in range(1, 9)] + ["n\nl.aep"])
+        bridge = AEPCatalogBridge(
+            go_parser_path=self._make_list_parser(),
+            max_workers=3,
+            cache_path=str(Path(self.temp_dir) / "one_shot.db"),
+            persistent=False,
+        )
+        try:
+            results = bridge.catalog_directory(str(aep_dir))
+        finally:
+            bridge.close()
+            
+        self.assertEqual(len(results), len(paths))
+        for path in paths:
+            self.assertEqual(bridge.cache[path]["file_path"], path)
+        # The newline path went to a per-file run; the rest split over max_workers lists
+        runs = (Path(self.temp_dir) / "list_runs.log").read_text().splitlines()
+        self.assertEqual(len(runs), 3)
+        
+    def test_one_shot_batch_falls_back_when_memfd_fails(self):
+        """Test list runs use a temporary file when memfd_create is unavailable"""
+        import errno
+        
+        paths = self._make_aep_files(Path(self.temp_dir) / "templates", ["a.aep", "b.aep"])
+        bridge = AEPCatalogBridge(
+            go_parser_path=self._make_list_parser(),
+            max_workers=1,
+            disk_cache=False,
+            persistent=False,
+        )
+        memfd_error = OSError(errno.ENOSYS, "Function not implemented")
+        with patch("python_bridge.os.memfd_create", side_effect=memfd_error, create=True):
+            results = bridge.batch_process(paths)
+        bridge.close()
+        
+        self.assertEqual([result["file_path"] for result in results], paths)
+        runs = (Path(self.temp_dir) / "list_runs.log").read_text().splitlines()
+        self.assertEqual(len(runs), 1)
+        
+    def test_unclosed_bridge_reaps_workers_when_collected(self):
+        """Test the finalizer stops parser processes of a bridge that was never closed"""
+        import gc
+        
+        aep_file = self._make_aep_files(Path(self.temp_dir) / "templates", ["a.aep"])[0]
+        bridge = AEPCatalogBridge(go_parser_path=self._make_serve_parser(), disk_cache=False)
+        bridge.parse_aep(aep_file)
+        procs = [worker.proc for worker in bridge._workers]
+        self.assertEqual(len(procs), 1)
+        
+        del bridge
+        gc.collect()
+        for proc in procs:
+            self.assertIsNotNone(proc.poll())
+            
+    def test_batch_process_with_more_threads_than_workers(self):
+        """Test batch_process threads beyond the pool size wait instead of hanging"""
+        import threading
+        
+        paths = self._make_aep_files(
+            Path(self.temp_dir) / "templates",
+            ["a.aep", "b.aep", "c.aep", "crash1.aep", "crash2.aep", "crash3.aep"],
+        )
+        bridge = AEPCatalogBridge(
+            go_parser_path=self._make_serve_parser(),
+            max_workers=1,
+            disk_cache=False,
+        )
+        results = []
+        
+        thread = threading.Thread(
+            target=lambda: results.append(bridge.batch_process(paths, max_workers=6)),
+            daemon=True,
+        )
+        thread.start()
+        thread.join(timeout=30)
+        bridge.close()
+        
+        self.assertFalse(thread.is_alive(), "batch_process deadlocked")
+        self.assertEqual([m["file_name"] for m in results[0]], ["a.aep", "b.aep", "c.aep"])
+        
+    def test_disk_cache_skips_unchanged_files(self):
+        """Test the sqlite cache is reused until the AEP file changes"""
+        aep_file = Path(self.temp_dir) / "cached.aep"
+        aep_file.write_bytes(b"RIFX")
+        
+        worker = MagicMock()
+        worker.parse.return_value = b'{"file_name": "cached.aep"}'
+        
+        with patch.object(self.bridge, '_checkout_worker') as mock_checkout:
+            mock_checkout.return_value.__enter__.return_value = worker
+            
+            first = self.bridge.parse_aep(str(aep_file))
+            self.bridge.cache.clear()
+            second = self.bridge.parse_aep(str(aep_file))
+            
+            # Rewriting the file changes its size, invalidating the entry
+            aep_file.write_bytes(b"RIFX-changed")
+            self.bridge.cache.clear()
+            self.bridge.parse_aep(str(aep_file))
+            
+        self.assertEqual(first, second)
+        self.assertEqual(worker.parse.call_count, 2)
+        
+    def test_aggregate_catalog(self):
+        """Test summary, category and tag counts are aggregated together"""
+        catalog_data = [
+            {"capabilities": {"text_replacement": True, "modular": True},
+             "categories": ["Title"], "tags": ["text", "intro"]},
+            {"capabilities": {"image_replacement": True},
+             "categories": ["Title", "Social"], "tags": ["text"]},
+            {"categories": [], "tags": []},
+        ]
+        
+        summary, categories, tags = self.bridge._aggregate_catalog(catalog_data)
+        
+        self.assertEqual(summary, {
+            "total_templates": 3,
+            "with_text_replacement": 1,
+            "with_image_replacement": 1,
+            "modular_templates": 1,
+        })
+        self.assertEqual(categories, {"Title": 2, "Social": 1})
+        self.assertEqual(tags, {"text": 2, "intro": 1})
+        
+    @unittest.skipUnless(CYTHON_AVAILABLE, "Cython extension not built (make python-ext)")
+    def test_cython_matches_python_implementation(self):
+        """Test the compiled and pure-Python hot paths produce identical output"""
+        metadata = {
+            "file_path": "/templates/intro.aep",
+            "file_name": "intro.aep",
+            "parsed_at": "2025-01-01T00:00:00Z",
+            "bit_depth": 16,
+            "expression_engine": "javascript-1.0",
+            "compositions": [
+                {"id": "1", "width": 1920, "height": 1080, "layer_count": 12},
+                {"id": "2", "width": 1080, "height": 1080, "layer_count": 3},
+                {"id": "3", "width": 1920, "height": 1080, "layer_count": 5},
+            ],
+            "text_layers": [
+                {"layer_name": "Title", "source_text": "Hello", "comp_id": "1"},
+                {"layer_name": "Subtitle", "source_text": "", "comp_id": "2"},
+            ],
+            "media_assets": [
+                {"name": "logo", "type": "image", "is_placeholder": True},
+                {"name": "bg", "type": "video", "is_placeholder": False},
+            ],
+            "effects": [{"name": "Glow"}, {"name": "Fill"}],
+            "opportunities": [
+                {"type": "text", "description": "Swap title", "difficulty": "easy", "impact": "high"},
+            ],
+            "categories": ["Title", "Social"],
+            "tags": ["text", "intro"],
+            "capabilities": {
+                "has_text_replacement": True,
+                "has_image_replacement": True,
+                "has_color_control": False,
+                "has_audio_replacement": False,
+                "has_data_driven": False,
+                "has_expressions": True,
+                "is_modular": False,
+            },
+        }
+        catalog_data = [
+            {"capabilities": {"text_replacement": True, "modular": True},
+             "categories": ["Title"], "tags": ["text", "intro"]},
+            {"capabilities": {"image_replacement": True},
+             "categories": ["Social", "Title"], "tags": ["text"]},
+            {"categories": [], "tags": []},
+        ]
+        
+        fast = (self.bridge.convert_to_mobot_format(metadata),
+                self.bridge._aggregate_catalog(catalog_data))
+        with patch("python_bridge.CYTHON_AVAILABLE", False):
+            slow = (self.bridge.convert_to_mobot_format(metadata),
+                    self.bridge._aggregate_catalog(catalog_data))
+            
+        # Compare serialized so key order, which reaches the reports, must match too
+        self.assertEqual(json.dumps(fast), json.dumps(slow))
+        
+    def test_disk_cache_misses_after_parser_rebuild(self):
+        """Test output from an older parser binary is not reused"""
+        aep_file = Path(self.temp_dir) / "cached.aep"
+        aep_file.write_bytes(b"RIFX")
+        parser = Path(self.temp_dir) / "aep_parser"
+        parser.write_bytes(b"v1")
+        cache_path = str(Path(self.temp_dir) / "rebuild.db")
+        
+        worker = MagicMock()
+        worker.parse.return_value = b'{"file_name": "cached.aep"}'
+        
+        def parse_with_fresh_bridge():
+            bridge = AEPCatalogBridge(go_parser_path=str(parser), cache_path=cache_path)
+            with patch.object(bridge, '_checkout_worker') as mock_checkout:
+                mock_checkout.return_value.__enter__.return_value = worker
+                bridge.parse_aep(str(aep_file))
+            bridge.close()
+            
+        parse_with_fresh_bridge()
+        parse_with_fresh_bridge()
+        self.assertEqual(worker.parse.call_count, 1)
+        
+        # A rebuilt binary has a different size, so its output is parsed afresh
+        parser.write_bytes(b"v2-rebuilt")
+        parse_with_fresh_bridge()
+        self.assertEqual(worker.parse.call_count, 2)
+        
+    def test_batch_process_preserves_order_and_skips_failures(self):
+        """Test batch_process returns parsed files in input order"""
+        paths = []
+        for name in ["one.aep", "broken.aep", "two.aep"]:
+            path = Path(self.temp_dir) / name
+            path.write_bytes(b"RIFX")
+            paths.append(str(path))
+        paths.append(str(Path(self.temp_dir) / "missing.aep"))
+        
+        def fake_parser(aep_path):
+            if aep_path.endswith("broken.aep"):
+                raise RuntimeError("Go parser failed: corrupt")
+            return json.dumps({"file_name": Path(aep_path).name}).encode()
+            
+        with patch.object(self.bridge, '_run_go_parser', side_effect=fake_parser):
+            results = self.bridge.batch_process(paths, max_workers=2)
+            
+        self.assertEqual([r["file_name"] for r in results], ["one.aep", "two.aep"])
+
+
 class TestBridgeIntegration(unittest.TestCase):
     """Integration tests for Python Bridge with Go parser"""
     